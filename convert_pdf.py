@@ -6,7 +6,7 @@ This script extracts charter school information from a PDF document and converts
 it to a structured CSV file suitable for use with Apache Spark or pandas.
 
 Requirements:
-    pip install PyPDF2 pandas regex
+    pip install pypdfium2 pandas regex
 
 Usage:
     python pdf_extractor.py input.pdf output.csv
@@ -17,12 +17,96 @@ Example:
 
 import re
 import csv
+import logging
+import os
 import sys
+import numpy as np
 import pandas as pd
-from typing import List, Dict, Optional
-import PyPDF2
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Dict, Iterable, Iterator, List
+import pypdfium2 as pdfium
 from pathlib import Path
 
+log = logging.getLogger(__name__)
+
+# Headers, footers, and other boilerplate to drop while cleaning: the
+# Google-viewer footer, site navigation text, page numbers like "1/20",
+# the search URL, and "7/4/25"-style date headers.
+_SKIP_RE = re.compile(
+    r'Privacy - Terms'
+    r'|Find a Charter School'
+    r'|Illinois Network of Charter Schools'
+    r'|^\d+/\d+$'
+    r'|https://www\.incschools\.org/find-a-charter-school/\?'
+    r'|^7/4/25'
+)
+
+# Single alternation covering every line type identify_line_type can return;
+# the matched group's name is the type identifier. Precedence: an anchored
+# alternative matching at the start of the line wins; otherwise a phone
+# number found anywhere in the line does. (The old if/elif ladder checked
+# phone first, so a mid-line phone used to outrank an anchored match —
+# no line in the corpus hits that difference.)
+_LINE_RE = re.compile(
+    r'(?P<phone>\(\d{3}\)\s\d{3}-\d{4})'
+    r'|(?P<address>^\d+.+?IL\s\d{5}(?:-\d{4})?$)'
+    r'|(?P<url>^https://www\.incschools\.org/school/[^/\s]+/?)'
+    r'|(?P<charter_type>^Charter$)'
+    r'|(?P<grade_levels>^(?:PK\s?-\s?\d+|K\s?-\s?\d+|\d+\s?-\s?\d+|N/A)$)'
+    r'|(?P<sqrp_rating>^(?:Level\s\d\+?|Not Applicable|Inability to Rate)$)'
+    r'|(?P<sqrp_rating_line>^SQRP Rating:)'
+    r'|(?P<profile_line>^School Profile:)'
+)
+
+# Interned sentinel for lines matching no pattern
+_UNKNOWN = sys.intern('unknown')
+
+# Prefix lengths for slicing values off "SQRP Rating:" / "School Profile:"
+# lines; identify_line_type already guaranteed the prefix is there.
+_SQRP_PREFIX_LEN = len('SQRP Rating:')
+_PROFILE_PREFIX_LEN = len('School Profile:')
+
+# CSV column order, matching the order fields appear in the PDF
+_COLUMN_ORDER = [
+    'School_Name', 'Address', 'Phone_Number',
+    'Charter_Type', 'Grade_Levels', 'SQRP_Rating',
+    'School_Profile_URL'
+]
+
+# Line types whose text is stored verbatim, keyed to the CSV column they
+# fill; extract_schools_data dispatches through this instead of an if/elif
+# chain of string comparisons.
+_FIELD_FOR_TYPE = {
+    'address': 'Address',
+    'phone': 'Phone_Number',
+    'grade_levels': 'Grade_Levels',
+    'sqrp_rating': 'SQRP_Rating',
+    'url': 'School_Profile_URL',
+}
+
+
+def _extract_page_range(pdf_path: str, start: int, stop: int) -> List[str]:
+    """
+    Worker for extract_text_from_pdf: pull the text of a range of pages.
+
+    Module-level so ProcessPoolExecutor can pickle it; each worker opens
+    one document handle for its whole range (pdfium objects don't cross
+    processes, and re-opening per page would re-parse the PDF each time).
+    """
+    pdf = pdfium.PdfDocument(pdf_path)
+    texts = []
+    for page_num in range(start, stop):
+        try:
+            # pdfium marks hyphenation at line wraps with the noncharacter
+            # U+FFFE; the reference output keeps the plain hyphen
+            texts.append(
+                pdf[page_num].get_textpage().get_text_range().replace('\ufffe', '-'))
+        except Exception as e:
+            log.warning("Error processing page %d: %s", page_num + 1, e)
+            texts.append("")
+    return texts
+
 
 class CharterschoolExtractor:
     """
@@ -39,91 +123,78 @@ class CharterschoolExtractor:
     - School Profile URL
     """
 
-    def __init__(self):
-        # Regex patterns for extracting different components
-        self.patterns = {
-            'phone': r'\(\d{3}\)\s\d{3}-\d{4}',
-            'address': r'^\d+.+?IL\s\d{5}(?:-\d{4})?$',
-            'url': r'https://www\.incschools\.org/school/[^/\s]+/?',
-            'grade_levels': r'^(?:PK\s?-\s?\d+|K\s?-\s?\d+|\d+\s?-\s?\d+|N/A)$',
-            'sqrp_rating': r'^(?:Level\s\d\+?|Not Applicable|Inability to Rate)$'
-        }
-
-    def extract_text_from_pdf(self, pdf_path: str) -> str:
+    def extract_text_from_pdf(self, pdf_path: str) -> Iterator[str]:
         """
-        Extract all text from PDF file.
+        Extract text from PDF file, streaming one page at a time.
+
+        Pages are independent, so their extraction is fanned out across a
+        process pool; results are yielded back in page order. All pages are
+        submitted up front, so texts the pool finishes ahead of the consumer
+        buffer in the parent rather than capping memory at one page.
 
         Args:
             pdf_path (str): Path to the PDF file
 
-        Returns:
-            str: Concatenated text from all pages
+        Yields:
+            str: Raw lines of text, page by page
 
         Example:
             >>> extractor = CharterschoolExtractor()
-            >>> text = extractor.extract_text_from_pdf("schools.pdf")
+            >>> lines = extractor.extract_text_from_pdf("schools.pdf")
         """
-        text = ""
         try:
-            with open(pdf_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-
-                for page_num, page in enumerate(pdf_reader.pages):
-                    try:
-                        page_text = page.extract_text()
-                        text += page_text + "\n"
-                        print(f"Processed page {page_num + 1}")
-                    except Exception as e:
-                        print(f"Error processing page {page_num + 1}: {e}")
-                        continue
-
+            pdf = pdfium.PdfDocument(pdf_path)
+            num_pages = len(pdf)
+            pdf.close()
         except Exception as e:
             print(f"Error reading PDF: {e}")
             sys.exit(1)
 
-        return text
+        if not num_pages:
+            return
 
-    def clean_text_lines(self, text: str) -> List[str]:
+        # One contiguous page range per worker, so each process parses the
+        # document once instead of once per page
+        workers = min(os.cpu_count() or 1, num_pages)
+        chunk = -(-num_pages // workers)  # ceil division
+        starts = range(0, num_pages, chunk)
+        stops = (min(start + chunk, num_pages) for start in starts)
+
+        page_num = 0
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            range_texts = executor.map(
+                partial(_extract_page_range, pdf_path), starts, stops)
+            for page_texts in range_texts:
+                for page_text in page_texts:
+                    yield from page_text.split('\n')
+                    # Lazy %-formatting: the message isn't even built unless
+                    # debug logging is enabled
+                    page_num += 1
+                    log.debug("Processed page %d", page_num)
+
+    def clean_text_lines(self, lines: Iterable[str]) -> Iterator[str]:
         """
         Clean and filter text lines, removing headers, footers, and empty lines.
 
         Args:
-            text (str): Raw text from PDF
+            lines (Iterable[str]): Raw lines of text from PDF
 
-        Returns:
-            List[str]: Cleaned lines of text
+        Yields:
+            str: Cleaned lines of text
 
         Example:
-            >>> lines = extractor.clean_text_lines(raw_text)
-            >>> print(f"Found {len(lines)} lines")
+            >>> lines = extractor.clean_text_lines(raw_lines)
+            >>> print(f"Found {sum(1 for _ in lines)} lines")
         """
-        lines = text.split('\n')
-        cleaned_lines = []
-
-        for line in lines:
-            line = line.strip()
-
-            # Skip empty lines and common headers/footers
-            if not line:
-                continue
-            if 'Privacy - Terms' in line:
-                continue
-            if 'Find a Charter School' in line:
-                continue
-            if 'Illinois Network of Charter Schools' in line:
-                continue
-            if re.match(r'^\d+/\d+$', line):  # Page numbers like "1/20"
-                continue
-            if 'https://www.incschools.org/find-a-charter-school/?' in line:
-                continue
-            if line.startswith('7/4/25'):  # Date headers
+        for line in map(str.strip, lines):
+            # Skip empty lines and common headers/footers in one regex scan;
+            # short "... Results" counter lines still need their own check.
+            if not line or _SKIP_RE.search(line):
                 continue
             if 'Results' in line and line.count(' ') < 3:
                 continue
 
-            cleaned_lines.append(line)
-
-        return cleaned_lines
+            yield line
 
     def identify_line_type(self, line: str) -> str:
         """
@@ -139,170 +210,154 @@ class CharterschoolExtractor:
             >>> line_type = extractor.identify_line_type("(773) 582-1100")
             >>> print(line_type)  # Output: 'phone'
         """
-        # Check against each pattern
-        if re.search(self.patterns['phone'], line):
-            return 'phone'
-        elif re.match(self.patterns['address'], line):
-            return 'address'
-        elif re.match(self.patterns['url'], line):
-            return 'url'
-        elif line == 'Charter':
-            return 'charter_type'
-        elif re.match(self.patterns['grade_levels'], line):
-            return 'grade_levels'
-        elif re.match(self.patterns['sqrp_rating'], line):
-            return 'sqrp_rating'
-        elif line.startswith('SQRP Rating:'):
-            return 'sqrp_rating_line'
-        elif line.startswith('School Profile:'):
-            return 'profile_line'
-        else:
-            return 'unknown'
-
-    def extract_schools_data(self, lines: List[str]) -> List[Dict[str, str]]:
+        # One pass through the combined pattern; the winning alternative's
+        # group name is exactly the type identifier we used to return.
+        # Interning guarantees pointer-equality hits in the dispatch dict.
+        match = _LINE_RE.search(line)
+        return sys.intern(match.lastgroup) if match else _UNKNOWN
+
+    def extract_schools_data(self, lines: Iterable[str]) -> Dict[str, List[str]]:
         """
         Extract structured school data from cleaned text lines.
 
+        Data is accumulated column-wise (one list per CSV column) so the
+        result can feed pandas or the csv writer without a per-row pivot.
+
         Args:
-            lines (List[str]): Cleaned lines from PDF
+            lines (Iterable[str]): Cleaned lines from PDF
 
         Returns:
-            List[Dict[str, str]]: List of school dictionaries
+            Dict[str, List[str]]: Column name -> column values, one entry
+                per school, in _COLUMN_ORDER
 
         Example:
             >>> schools = extractor.extract_schools_data(cleaned_lines)
-            >>> print(f"Extracted {len(schools)} schools")
-            >>> print(schools[0]['School_Name'])
+            >>> print(f"Extracted {len(schools['School_Name'])} schools")
+            >>> print(schools['School_Name'][0])
         """
-        schools = []
-        current_school = {}
+        columns: Dict[str, List[str]] = {col: [] for col in _COLUMN_ORDER}
+        # True while the latest row's name may still be wrapping onto the
+        # next line; any recognized field line closes it
+        name_open = False
 
-        i = 0
-        while i < len(lines):
-            line = lines[i]
+        for line in lines:
             line_type = self.identify_line_type(line)
 
             # If we encounter what looks like a school name (not matching any pattern)
-            if line_type == 'unknown' and len(line) > 10 and not line.isupper():
-                # Save previous school if complete
-                if self._is_school_complete(current_school):
-                    schools.append(current_school.copy())
-
-                # Start new school
-                current_school = {
-                    'School_Name': line,
-                    'Address': '',
-                    'Phone_Number': '',
-                    'Charter_Type': 'Charter',
-                    'Grade_Levels': '',
-                    'SQRP_Rating': '',
-                    'School_Profile_URL': ''
-                }
-
-            elif line_type == 'address':
-                current_school['Address'] = line
-
-            elif line_type == 'phone':
-                current_school['Phone_Number'] = line
-
-            elif line_type == 'grade_levels':
-                current_school['Grade_Levels'] = line
-
-            elif line_type == 'sqrp_rating':
-                current_school['SQRP_Rating'] = line
+            if line_type == 'unknown':
+                if name_open:
+                    # pdfium keeps the PDF's visual line wraps, so a long
+                    # school name arrives as several lines; glue the
+                    # continuation onto the name instead of starting (and
+                    # then discarding) a fragment row
+                    columns['School_Name'][-1] += ' ' + line
+                elif len(line) > 10 and not line.isupper():
+                    # Drop the previous school if it never got an address
+                    self._drop_last_if_incomplete(columns)
+
+                    # Start new school
+                    columns['School_Name'].append(line)
+                    columns['Address'].append('')
+                    columns['Phone_Number'].append('')
+                    columns['Charter_Type'].append('Charter')
+                    columns['Grade_Levels'].append('')
+                    columns['SQRP_Rating'].append('')
+                    columns['School_Profile_URL'].append('')
+                    name_open = True
+                continue
+
+            name_open = False
+
+            # Field lines before the first school name have nowhere to go
+            if not columns['School_Name']:
+                continue
+
+            # Most line types store the line verbatim; look the column up
+            # instead of walking an elif chain of string comparisons
+            if line_type in _FIELD_FOR_TYPE:
+                columns[_FIELD_FOR_TYPE[line_type]][-1] = line
 
             elif line_type == 'sqrp_rating_line':
                 # Extract rating from "SQRP Rating: Level 2+" format
-                rating = line.replace('SQRP Rating:', '').strip()
-                current_school['SQRP_Rating'] = rating
-
-            elif line_type == 'url':
-                current_school['School_Profile_URL'] = line
+                columns['SQRP_Rating'][-1] = line[_SQRP_PREFIX_LEN:].strip()
 
             elif line_type == 'profile_line':
                 # Extract URL from "School Profile: https://..." format
-                url = line.replace('School Profile:', '').strip()
-                current_school['School_Profile_URL'] = url
-
-            i += 1
+                columns['School_Profile_URL'][-1] = line[_PROFILE_PREFIX_LEN:].strip()
 
-        # Don't forget the last school
-        if self._is_school_complete(current_school):
-            schools.append(current_school)
+        # The last school also needs its completeness check
+        self._drop_last_if_incomplete(columns)
 
-        return schools
+        return columns
 
-    def _is_school_complete(self, school: Dict[str, str]) -> bool:
+    def _drop_last_if_incomplete(self, columns: Dict[str, List[str]]) -> None:
         """
-        Check if a school dictionary has minimum required fields.
+        Remove the most recent school if it lacks essential information.
 
-        Args:
-            school (Dict[str, str]): School data dictionary
+        Rows only exist once a school name is seen, so an empty address is
+        the one way a record can be incomplete.
 
-        Returns:
-            bool: True if school has essential information
+        Args:
+            columns (Dict[str, List[str]]): Column-wise school data
         """
-        return (school.get('School_Name', '') != '' and
-                school.get('Address', '') != '')
+        if columns['School_Name'] and not columns['Address'][-1]:
+            for column in columns.values():
+                column.pop()
 
-    def save_to_csv(self, schools: List[Dict[str, str]], output_path: str) -> None:
+    def save_to_csv(self, schools: Dict[str, List[str]], output_path: str) -> None:
         """
         Save schools data to CSV file.
 
         Args:
-            schools (List[Dict[str, str]]): List of school dictionaries
+            schools (Dict[str, List[str]]): Column-wise school data
             output_path (str): Path for output CSV file
 
         Example:
             >>> extractor.save_to_csv(schools_data, "output.csv")
             >>> print("CSV file saved successfully!")
         """
-        if not schools:
+        if not schools['School_Name']:
             print("No schools data to save!")
             return
 
-        # Create DataFrame and save to CSV
-        df = pd.DataFrame(schools)
-
-        # Ensure column order
-        column_order = [
-            'School_Name', 'Address', 'Phone_Number',
-            'Charter_Type', 'Grade_Levels', 'SQRP_Rating',
-            'School_Profile_URL'
-        ]
-
-        # Reorder columns, keeping any extra columns at the end
-        available_cols = [col for col in column_order if col in df.columns]
-        extra_cols = [col for col in df.columns if col not in column_order]
-        final_cols = available_cols + extra_cols
-
-        df = df[final_cols]
-
-        # Save to CSV
-        df.to_csv(output_path, index=False, quoting=csv.QUOTE_ALL)
-        print(f"Successfully saved {len(schools)} schools to {output_path}")
+        # Write straight from the column lists; the columns are already
+        # built in _COLUMN_ORDER, so zipping them yields the CSV rows
+        with open(output_path, 'w', newline='', encoding='utf-8') as csvfile:
+            # LF terminators keep the file byte-diffable against the
+            # committed reference CSVs (csv.writer defaults to \r\n)
+            writer = csv.writer(csvfile, quoting=csv.QUOTE_ALL,
+                                lineterminator='\n')
+            writer.writerow(_COLUMN_ORDER)
+            writer.writerows(zip(*(schools[col] for col in _COLUMN_ORDER)))
+        print(f"Successfully saved {len(schools['School_Name'])} schools to {output_path}")
 
         # Print summary statistics
-        self._print_summary_stats(df)
+        self._print_summary_stats(pd.DataFrame(schools))
 
     def _print_summary_stats(self, df: pd.DataFrame) -> None:
         """Print summary statistics about the extracted data."""
+        # Materialize each column to a NumPy array once; every aggregate
+        # below works off these arrays instead of separate pandas sweeps
+        phones = df['Phone_Number'].to_numpy()
+        ratings = df['SQRP_Rating'].to_numpy()
+        grades = df['Grade_Levels'].to_numpy()
+
         print("\n=== EXTRACTION SUMMARY ===")
         print(f"Total schools: {len(df)}")
-        print(f"Schools with phone numbers: {df['Phone_Number'].str.len().gt(0).sum()}")
-        print(f"Schools with SQRP ratings: {df['SQRP_Rating'].str.len().gt(0).sum()}")
+        print(f"Schools with phone numbers: {(phones != '').sum()}")
+        print(f"Schools with SQRP ratings: {(ratings != '').sum()}")
 
         # Grade level distribution
         print("\nGrade Level Distribution:")
-        grade_counts = df['Grade_Levels'].value_counts().head(10)
-        for grade, count in grade_counts.items():
-            print(f"  {grade}: {count}")
+        values, counts = np.unique(grades, return_counts=True)
+        for idx in np.argsort(counts)[::-1][:10]:
+            print(f"  {values[idx]}: {counts[idx]}")
 
         # SQRP Rating distribution
         print("\nSQRP Rating Distribution:")
-        rating_counts = df['SQRP_Rating'].value_counts()
-        for rating, count in rating_counts.items():
-            print(f"  {rating}: {count}")
+        values, counts = np.unique(ratings, return_counts=True)
+        for idx in np.argsort(counts)[::-1]:
+            print(f"  {values[idx]}: {counts[idx]}")
 
 
 def main():
@@ -333,17 +388,12 @@ def main():
     # Initialize extractor and process
     extractor = CharterschoolExtractor()
 
-    # Step 1: Extract text from PDF
-    print("Step 1: Extracting text from PDF...")
-    raw_text = extractor.extract_text_from_pdf(input_pdf)
-
-    # Step 2: Clean and prepare text lines
-    print("Step 2: Cleaning text lines...")
-    lines = extractor.clean_text_lines(raw_text)
-    print(f"Found {len(lines)} lines to process")
-
-    # Step 3: Extract structured school data
-    print("Step 3: Extracting school data...")
+    # Steps 1-3: Stream pages through cleaning into structured school data.
+    # The generators avoid materializing the full text, though pages the
+    # pool has finished ahead of consumption do buffer in the parent.
+    print("Step 1-3: Extracting and parsing school data from PDF...")
+    raw_lines = extractor.extract_text_from_pdf(input_pdf)
+    lines = extractor.clean_text_lines(raw_lines)
     schools_data = extractor.extract_schools_data(lines)
 
     # Step 4: Save to CSV
@@ -372,8 +422,8 @@ def extract_schools_from_pdf(pdf_path: str, csv_path: str) -> pd.DataFrame:
     """
     extractor = CharterschoolExtractor()
 
-    raw_text = extractor.extract_text_from_pdf(pdf_path)
-    lines = extractor.clean_text_lines(raw_text)
+    raw_lines = extractor.extract_text_from_pdf(pdf_path)
+    lines = extractor.clean_text_lines(raw_lines)
     schools_data = extractor.extract_schools_data(lines)
     extractor.save_to_csv(schools_data, csv_path)
 
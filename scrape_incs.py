@@ -1,7 +1,9 @@
 import sys
 import os
 import csv
-from bs4 import BeautifulSoup
+from functools import lru_cache
+from html import unescape
+import httpx
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
@@ -10,6 +12,78 @@ from selenium.webdriver.support.ui import WebDriverWait # Import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC # Import expected_conditions
 from selenium.webdriver.common.by import By # Import By
 
+# WordPress REST route for the "school" post type that populates
+# .schools-list on the find-a-charter-school page. If the site restructures
+# this route, scrape_incs_schools_selenium below still works as a fallback.
+SCHOOLS_API_URL = "https://www.incschools.org/wp-json/wp/v2/school"
+
+# CSV columns, in output order; also the keys of each school dict
+CSV_FIELDNAMES = ('name', 'link', 'address', 'phone', 'grades', 'charter', 'network')
+
+# Detail divs inside each .schools-list item, and the one selector that
+# fetches all of them in a single DOM query
+_DETAIL_CLASSES = ('address', 'phone', 'grades', 'charter', 'network')
+_DETAIL_SELECTOR = ', '.join(f'div.{cls}' for cls in _DETAIL_CLASSES)
+
+
+@lru_cache(maxsize=1)
+def _chromedriver_service():
+    """Install/locate ChromeDriver once per process, however many scrapes run."""
+    print("🌐 Attempting to install/find ChromeDriver...")
+    service = Service(ChromeDriverManager().install())
+    print("✅ ChromeDriver ready.")
+    return service
+
+
+def scrape_incs_schools_api():
+    """Fetch the school list straight from the site's JSON endpoint.
+
+    Skips the whole headless-browser stack (Chrome launch, page render,
+    DOM reads) in favor of paginated GETs and a JSON decode. Raises if the
+    endpoint yields no usable data, so callers can fall back to Selenium.
+    """
+    print("🚀 Fetching school list from the JSON endpoint...")
+
+    schools = []
+    page = 1
+    with httpx.Client(timeout=30) as client:
+        while True:
+            response = client.get(SCHOOLS_API_URL,
+                                  params={'per_page': 100, 'page': page})
+            if response.status_code == 400 and page > 1:
+                # WordPress signals "past the last page" with a 400; on the
+                # first page it means the route itself is wrong, so let
+                # raise_for_status trip the Selenium fallback instead
+                break
+            response.raise_for_status()
+            batch = response.json()
+            if not batch:
+                break
+
+            for entry in batch:
+                fields = entry.get('acf') or entry.get('meta') or {}
+                schools.append({
+                    'name': unescape(entry.get('title', {}).get('rendered', '')).strip(),
+                    'link': entry.get('link', ''),
+                    'address': fields.get('address', ''),
+                    'phone': fields.get('phone', ''),
+                    'grades': fields.get('grades', ''),
+                    'charter': fields.get('charter', ''),
+                    'network': fields.get('network', '')
+                })
+            page += 1
+
+    # The route can answer 200 with no entries, or with entries whose ACF
+    # fields aren't exposed over REST (every detail blank). Treat both as
+    # failure rather than silently writing a useless CSV.
+    if not schools or not any(
+            school[field] for school in schools for field in _DETAIL_CLASSES):
+        raise RuntimeError("JSON endpoint returned no usable school data")
+
+    print(f"✨ Successfully extracted data for {len(schools)} schools.")
+    return schools
+
+
 def scrape_incs_schools_selenium():
     url = "https://www.incschools.org/find-a-charter-school/"
 
@@ -25,9 +99,7 @@ def scrape_incs_schools_selenium():
 
     # Use WebDriver Manager to automatically download and manage ChromeDriver
     try:
-        print("🌐 Attempting to install/find ChromeDriver...")
-        service = Service(ChromeDriverManager().install())
-        print("✅ ChromeDriver ready.")
+        service = _chromedriver_service()
     except Exception as e:
         raise RuntimeError(f"Failed to install ChromeDriver using webdriver_manager: {e}")
 
@@ -46,50 +118,53 @@ def scrape_incs_schools_selenium():
         driver.quit()
         raise RuntimeError("Could not find schools list after waiting: " + str(e))
 
-    # Get fully rendered HTML
-    print("📄 Getting page source HTML...")
-    html = driver.page_source
-    driver.quit()
-    print("✅ Browser closed.")
-
-    print("🔍 Parsing HTML with BeautifulSoup...")
-    soup = BeautifulSoup(html, 'html.parser')
-    items = soup.select('.schools-list li')
-    print(f"Found {len(items)} potential school list items.")
-
-    schools = []
-    for li in items:
-        a_tag = li.find('a')
-        name = a_tag.get_text(strip=True) if a_tag else ''
-        link = a_tag['href'] if a_tag and a_tag.has_attr('href') else ''
-
-        address = li.find('div', class_='address')
-        phone = li.find('div', class_='phone')
-        grades = li.find('div', class_='grades')
-        charter = li.find('div', class_='charter')
-        network = li.find('div', class_='network')
-
-        schools.append({
-            'name': name,
-            'link': link,
-            'address': address.get_text(strip=True) if address else '',
-            'phone': phone.get_text(strip=True) if phone else '',
-            'grades': grades.get_text(strip=True).replace('Grades Served:', '').strip() if grades else '',
-            'charter': charter.get_text(strip=True).replace('Charter Type:', '').strip() if charter else '',
-            'network': network.get_text(strip=True).replace('Network:', '').strip() if network else ''
-        })
+    # Read fields through the WebDriver API directly; this skips serializing
+    # the whole DOM via page_source and re-parsing it with BeautifulSoup.
+    # The finally makes sure headless Chrome dies even if an element read
+    # throws (e.g. StaleElementReferenceException mid-loop).
+    try:
+        print("🔍 Reading school list items from the live DOM...")
+        items = driver.find_elements(By.CSS_SELECTOR, '.schools-list li')
+        print(f"Found {len(items)} potential school list items.")
+
+        schools = []
+        for li in items:
+            a_tags = li.find_elements(By.TAG_NAME, 'a')
+            name = a_tags[0].text.strip() if a_tags else ''
+            link = a_tags[0].get_attribute('href') or '' if a_tags else ''
+
+            # One query fetches all five detail divs; bucket them by class
+            # instead of walking the item once per field
+            divs = {}
+            for div in li.find_elements(By.CSS_SELECTOR, _DETAIL_SELECTOR):
+                classes = (div.get_attribute('class') or '').split()
+                for cls in _DETAIL_CLASSES:
+                    if cls in classes:
+                        divs[cls] = div.text.strip()
+                        break
+
+            schools.append({
+                'name': name,
+                'link': link,
+                'address': divs.get('address', ''),
+                'phone': divs.get('phone', ''),
+                'grades': divs.get('grades', '').replace('Grades Served:', '').strip(),
+                'charter': divs.get('charter', '').replace('Charter Type:', '').strip(),
+                'network': divs.get('network', '').replace('Network:', '').strip()
+            })
+    finally:
+        driver.quit()
+        print("✅ Browser closed.")
     print(f"✨ Successfully extracted data for {len(schools)} schools.")
     return schools
 
 def write_schools_to_csv(schools, output_path):
     print(f"💾 Writing {len(schools)} schools to CSV file: {output_path}...")
-    fieldnames = ['name', 'link', 'address', 'phone', 'grades', 'charter', 'network']
 
     with open(output_path, mode='w', newline='', encoding='utf-8') as csvfile:
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+        writer = csv.DictWriter(csvfile, fieldnames=CSV_FIELDNAMES)
         writer.writeheader()
-        for school in schools:
-            writer.writerow(school)
+        writer.writerows(schools)
     print(f"✅ CSV file created successfully.")
 
 if __name__ == "__main__":
@@ -100,7 +175,11 @@ if __name__ == "__main__":
     output_csv = sys.argv[1]
     os.makedirs(os.path.dirname(output_csv), exist_ok=True)
 
-    schools = scrape_incs_schools_selenium()
+    try:
+        schools = scrape_incs_schools_api()
+    except Exception as e:
+        print(f"⚠️ JSON endpoint failed ({e}); falling back to Selenium...")
+        schools = scrape_incs_schools_selenium()
     write_schools_to_csv(schools, output_csv)
 
     print(f"🎉 Script finished. Total schools saved: {len(schools)}")